@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import json
 import requests
 from selenium import webdriver
@@ -7,9 +8,24 @@ from selenium.webdriver.chrome.service import Service
 from bs4 import BeautifulSoup
 import re
 import math
+import heapq
+import random
 import sys
 import threading
 import time
+import gzip
+import mmap
+import os
+import hashlib
+import argparse
+import multiprocessing
+import sqlite3
+import platform
+from contextlib import closing
+from datetime import datetime, timezone
+from dataclasses import dataclass, replace
+from statistics import NormalDist
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # Web Scraping Program for Chrono24 Luxury Watches
 # This program uses Selenium WebDriver for automated web browsing, BeautifulSoup for HTML parsing,
@@ -22,7 +38,11 @@ import time
 # The architecture of the program is centered around modular classes:
 # - Header: Manages HTTP headers to simulate genuine browser requests and avoid bot detection.
 # - Driver: Configures and controls the Selenium WebDriver with headless browsing capabilities.
+# - Deadline: Time budget and cancellation token, so that crawls can return partial results in time.
+# - SearchQuery: Immutable description of one search results page request, so one Chrono can serve concurrent requests.
 # - Chrono: Inherits from Driver and is tailored to interact specifically with the Chrono24 website. It handles search queries, pagination, data retrieval, and parsing.
+# - PageArchive: Stores every fetched page in a compressed, append-only archive so the data can be re-parsed offline.
+# - WorkQueue: Durable SQLite queue of (query, page) tasks, so that several worker processes or machines can share a crawl.
 # - Menu: Provides a user interface via the console for inputting search criteria, choosing data retrieval options, and deciding on data export.
 #
 # The main function serves as the application's entry point, coordinating the sequence of operations:
@@ -136,21 +156,501 @@ class Driver:
 		return self.driver
 
 
-def createSoupObject(url : str, header : dict, parser : str) -> BeautifulSoup:
+class PageArchive:
+	"""
+	Stores the raw HTML of fetched pages in a compressed, append-only archive file, so that pages can be
+	re-parsed later without going back to the network (e.g. when the site markup changes or a new field is needed).
+
+	Every page is written as an independent gzip member at the end of the archive file. Next to the archive an
+	index file ('<path>.idx') is kept, containing one JSON line per page with the URL, the fetch time, the kind of
+	request the page was fetched for, a digest of the content and the byte offset and length of the compressed member. Because every member can be decompressed
+	on its own, the index allows random access to any page through a memory-mapped view of the archive.
+
+	Attributes:
+		path (str): Path of the archive file.
+		indexPath (str): Path of the index file belonging to the archive.
+		lock (threading.Lock): Serialises appends, so that one archive can be shared between threads.
+	"""
+	def __init__(self, path : str):
+		"""
+		Initializes the archive for the given path. The archive and index files are created on the first write.
+
+		Parameters:
+			path (str): Path of the archive file (e.g. 'pages.warc.gz').
+		"""
+		self.path = path
+		self.indexPath = path + ".idx"
+		self.lock = threading.Lock()
+
+	def getPath(self) -> str:
+		"""
+		Retrieves the path of the archive file.
+
+		Returns:
+			str: The path of the archive file.
+		"""
+		return self.path
+
+	def append(self, url : str, html : str, kind : str = 'offers') -> dict:
+		"""
+		Compresses a page and appends it to the archive, then records its position in the index.
+
+		The archive is written before the index, so an interrupted write leaves at most an unreferenced
+		member at the end of the archive, never an index entry pointing to incomplete data. An index line
+		that was cut off by an interrupted write is terminated before the next record is added, so that
+		only the interrupted record is lost (see 'records').
+
+		Parameters:
+			url (str): URL the page was fetched from.
+			html (str): Raw HTML content of the page.
+			kind (str): What the page was fetched for: 'offers' for pages whose offers are loaded, or e.g.
+				'listingSize' for pages only fetched to count the listings, which are skipped on replay.
+
+		Returns:
+			dict: The index record of the stored page.
+		"""
+		body = html.encode('utf-8')
+		data = gzip.compress(body)
+		with self.lock:
+			with open(self.path, 'ab') as f:
+				offset = f.seek(0, os.SEEK_END)
+				f.write(data)
+			record = {'url' : url,
+					  'fetched' : datetime.now(timezone.utc).isoformat(),
+					  'kind' : kind,
+					  'digest' : hashlib.sha1(body).hexdigest(),
+					  'offset' : offset,
+					  'length' : len(data)}
+			with open(self.indexPath, 'a+b') as f:
+				separator = b""
+				if f.seek(0, os.SEEK_END) > 0:
+					f.seek(-1, os.SEEK_END)
+					separator = b"" if f.read(1) == b"\n" else b"\n"
+				f.write(separator + (json.dumps(record) + "\n").encode('utf-8'))
+		return record
+
+	def records(self) -> list:
+		"""
+		Reads the index of the archive.
+
+		Lines that cannot be parsed, i.e. index records cut off by an interrupted write, are skipped.
+
+		Returns:
+			list: The index records in the order in which the pages were archived. Empty if nothing was archived yet.
+		"""
+		if not os.path.exists(self.indexPath):
+			return []
+		records = []
+		with open(self.indexPath, encoding='utf-8', errors='replace') as f:
+			for line in f:
+				try:
+					records.append(json.loads(line))
+				except ValueError:
+					continue
+		return records
+
+	def read(self, record : dict) -> str:
+		"""
+		Reads a single archived page.
+
+		Parameters:
+			record (dict): An index record as returned by 'records'.
+
+		Returns:
+			str: The raw HTML content of the page.
+		"""
+		with open(self.path, 'rb') as f:
+			with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+				return readArchiveMember(view, record)
+
+
+def readArchiveMember(view, record : dict) -> str:
+	"""
+	Decompresses one page from a (memory-mapped) archive.
+
+	Parameters:
+		view (mmap.mmap or bytes): The content of the archive file.
+		record (dict): The index record of the page.
+
+	Returns:
+		str: The raw HTML content of the page.
+	"""
+	start = record['offset']
+	return gzip.decompress(view[start:start + record['length']]).decode('utf-8')
+
+
+class DeadlineExceeded(Exception):
+	"""
+	Raised when a request is about to be made after its Deadline has expired or was cancelled.
+	"""
+
+
+class Deadline:
+	"""
+	Time budget and cancellation token for crawling operations.
+
+	A Deadline is created with a number of seconds and passed to the fetching methods of the Chrono class.
+	Before every request the remaining time is checked: requests are only made while time is left, and the
+	remaining time is used as the request timeout, so that no request outlives the deadline by much. A deadline
+	can also be cancelled explicitly from another thread, which stops all requests that have not started yet.
+
+	Attributes:
+		expiresAt (float): Point in time (time.monotonic) at which the deadline expires, or None for no time limit.
+		cancelled (threading.Event): Set once the deadline was cancelled.
+	"""
+	def __init__(self, seconds : float = None):
+		"""
+		Initializes the deadline, starting the time budget immediately.
+
+		Parameters:
+			seconds (float): The time budget in seconds, or None for a deadline that only ends when cancelled.
+		"""
+		self.expiresAt = None if seconds is None else time.monotonic() + seconds
+		self.cancelled = threading.Event()
+
+	def cancel(self) -> None:
+		"""
+		Cancels the deadline, so that no further requests are made with it.
+		"""
+		self.cancelled.set()
+
+	def remaining(self) -> float:
+		"""
+		Retrieves the time left until the deadline expires.
+
+		Returns:
+			float: The remaining seconds (0 if expired or cancelled), or None if there is no time limit.
+		"""
+		if self.cancelled.is_set():
+			return 0
+		if self.expiresAt is None:
+			return None
+		return max(0, self.expiresAt - time.monotonic())
+
+	def expired(self) -> bool:
+		"""
+		Checks whether the deadline has expired or was cancelled.
+
+		Returns:
+			bool: True if no more requests should be made, False otherwise.
+		"""
+		return self.remaining() == 0
+
+	def requestTimeout(self) -> float:
+		"""
+		Retrieves the timeout to be used for the next request.
+
+		Returns:
+			float: The remaining seconds, or None if there is no time limit.
+
+		Raises:
+			DeadlineExceeded: If the deadline has expired or was cancelled.
+		"""
+		remaining = self.remaining()
+		if remaining == 0:
+			raise DeadlineExceeded("Deadline exceeded, request not made")
+		return remaining
+
+
+def requestTimeout(deadline : Deadline) -> float:
+	"""
+	Retrieves the timeout for a request made under an optional deadline.
+
+	Parameters:
+		deadline (Deadline): The deadline of the request, or None for no time limit.
+
+	Returns:
+		float: The timeout in seconds for 'requests', or None for no timeout.
+
+	Raises:
+		DeadlineExceeded: If the deadline has expired or was cancelled.
+	"""
+	return None if deadline is None else deadline.requestTimeout()
+
+
+def createSoupObject(url : str, header : dict, parser : str, archive : PageArchive = None, deadline : Deadline = None,
+					 kind : str = 'offers') -> BeautifulSoup:
 	"""
 	Fetches a webpage at the specified URL with the provided headers and creates a BeautifulSoup object for parsing.
 	Parameters:
 		url (str): URL of the webpage to be fetched.
 		header (dict): HTTP headers for the request.
 		parser (str): Parser to be used by BeautifulSoup.
+		archive (PageArchive): Optional archive in which the raw HTML of the page is stored before parsing.
+		deadline (Deadline): Optional deadline, its remaining time is used as the request timeout.
+		kind (str): What the page is fetched for, recorded in the archive (see 'PageArchive.append').
 	Returns:
 		BeautifulSoup: An object to parse and navigate the HTML structure of the page.
+	Raises:
+		DeadlineExceeded: If the deadline has expired before the request is made.
 	"""
-	req = requests.get(url, headers=header)
+	req = requests.get(url, headers=header, timeout=requestTimeout(deadline))
 	assert req.status_code == 200, "Error: Status Code is not 200"
+	if archive is not None:
+		archive.append(url, req.text, kind)
 	soup = BeautifulSoup(req.text, parser)
 	return soup
 
+def parseLdJson(soup : BeautifulSoup) -> dict:
+	"""
+	Extracts the JSON-LD structured data from a parsed search results page.
+	Parameters:
+		soup (BeautifulSoup): The parsed search results page.
+	Returns:
+		dict: A dictionary representing the parsed JSON-LD content from the page.
+	"""
+	return json.loads("".join(soup.find("script", {"type" : "application/ld+json"}).contents))
+
+def parseListingSize(soup : BeautifulSoup) -> int:
+	"""
+	Extracts the total number of listings of a search from a parsed search results page.
+	Parameters:
+		soup (BeautifulSoup): The parsed search results page.
+	Returns:
+		int: The number of listings, or None if the page does not show it.
+	"""
+	result = soup.find_all("strong", string=re.compile("listings$"))
+	if not result:
+		return None
+	size_str = result[0].text.split(" ")[0]
+	size_str = size_str.replace(',', '')  # Remove commas from the string
+	return int(size_str)
+
+def extractOffers(ldJson : dict) -> list:
+	"""
+	Extracts the offers from the JSON-LD structured data of a search results page.
+	Parameters:
+		ldJson (dict): The JSON-LD content of the page, as returned by 'parseLdJson'.
+	Returns:
+		list: A list containing the offers of the page. Each offer is represented as a dictionary.
+	"""
+	return ldJson['@graph'][1].get('offers')
+
+def buildOffersTable(offers : list, dropIncomplete : bool = True):
+	"""
+	Converts a list of offers (possibly containing nested lists of offers) into a cleaned pandas DataFrame.
+
+	The offers are flattened and normalized, rows with NA values are dropped (unless 'dropIncomplete' is False)
+	and the 'price' column is converted to integers when it is available.
+
+	Parameters:
+		offers (list): The offers to be converted.
+		dropIncomplete (bool): If True, offers with a missing field are dropped.
+	Returns:
+		pandas.DataFrame: A DataFrame containing structured and cleaned offer data.
+	"""
+	table = pd.json_normalize(flatten_list_of_dicts(offers))
+	if dropIncomplete:
+		table = table.dropna(axis=0)
+	try:
+		table['price'] = table['price'].astype(int)
+	except KeyError as e:
+		print('Price column not available, hence the price is on request')
+	return table
+
+def offerPrice(offer : dict) -> float:
+	"""
+	Extracts the price of an offer.
+	Parameters:
+		offer (dict): An offer as found in the JSON-LD data of a search results page.
+	Returns:
+		float: The price of the offer, or None if the price is not available (e.g. price on request).
+	"""
+	try:
+		return float(offer.get('price'))
+	except (TypeError, ValueError):
+		return None
+
+def studentQuantile(p : float, df : int) -> float:
+	"""
+	Computes a quantile of the Student t distribution with an integer number of degrees of freedom.
+
+	The distribution function has a closed form for integer degrees of freedom (a finite series in the angle
+	atan(t / sqrt(df))), which is inverted by bisection, so the quantile is exact also for one or two degrees
+	of freedom, where approximations around the normal quantile are far too small.
+	Parameters:
+		p (float): The probability, e.g. 0.975.
+		df (int): The degrees of freedom, at least 1.
+	Returns:
+		float: The quantile.
+	"""
+	def centralProbability(t):
+		# P(|T| < t)
+		theta = math.atan(t / math.sqrt(df))
+		cos2 = math.cos(theta) ** 2
+		if df % 2:
+			total, term, k = theta, math.sin(theta) * math.cos(theta), 1
+		else:
+			total, term, k = 0.0, math.sin(theta), 0
+		while k < df:
+			total += term
+			term *= cos2 * (k + 1) / (k + 2)
+			k += 2
+		return 2 / math.pi * total if df % 2 else total
+
+	target = abs(2 * p - 1)
+	lower, upper = 0.0, 1.0
+	while centralProbability(upper) < target:
+		upper *= 2
+	for i in range(100):
+		middle = (lower + upper) / 2
+		if centralProbability(middle) < target:
+			lower = middle
+		else:
+			upper = middle
+	return math.copysign((lower + upper) / 2, p - 0.5)
+
+def estimatePriceStatistics(pagePrices : list, totalPages : int, confidence : float = 0.95,
+							quantiles : tuple = (0.25, 0.5, 0.75), seed : int = None, resamples : int = 1000):
+	"""
+	Estimates the mean and quantiles of the prices of a search from a random sample of its pages.
+
+	Since whole pages are sampled, the pages are treated as clusters: the standard errors are obtained by a
+	cluster bootstrap, resampling the sampled pages with replacement. The intervals use the quantile of the
+	Student t distribution with one degree of freedom less than the number of pages with prices, and are scaled
+	by the finite population correction, so that they shrink to the point estimate once every page of the
+	search has been sampled.
+
+	With only a few pages the intervals are somewhat too narrow for skewed price distributions: in simulations
+	with 3 to 10 of 50 pages, 95% intervals covered the true mean in about 92-95% of the cases.
+
+	Parameters:
+		pagePrices (list): One list of prices per sampled page.
+		totalPages (int): Total number of pages of the search.
+		confidence (float): Confidence level of the intervals.
+		quantiles (tuple): The quantiles to be estimated.
+		seed (int): Optional seed for the bootstrap.
+		resamples (int): Number of bootstrap resamples.
+	Returns:
+		pandas.DataFrame: The estimates with the columns 'estimate', 'lower' and 'upper', indexed by statistic.
+		The 'attrs' hold 'pagesTotal', 'pagesFetched', 'pagesPriced' (pages with at least one price), 'sampleSize',
+		'confidence' and 'relativeError' (relative half width of the confidence interval of the mean, infinite if
+		it cannot be determined).
+	"""
+	index = ['mean'] + [f"{q:.0%}" for q in quantiles]
+	pages = [np.asarray(prices, dtype=float) for prices in pagePrices if len(prices)]
+	table = pd.DataFrame(np.nan, index=index, columns=['estimate', 'lower', 'upper'])
+	table.attrs = {'pagesTotal' : totalPages, 'pagesFetched' : len(pagePrices), 'pagesPriced' : len(pages),
+				   'sampleSize' : int(sum(len(prices) for prices in pages)), 'confidence' : confidence,
+				   'relativeError' : math.inf}
+	if not pages:
+		return table
+
+	def statistics(sample):
+		prices = np.concatenate(sample)
+		return np.concatenate(([prices.mean()], np.quantile(prices, quantiles)))
+
+	estimate = statistics(pages)
+	table['estimate'] = estimate
+	fpc = math.sqrt(max(0.0, 1 - len(pagePrices) / totalPages)) if totalPages else 0.0
+	if fpc == 0.0:
+		table['lower'] = table['upper'] = estimate
+	elif len(pages) > 1:
+		n = len(pages)
+		rng = np.random.default_rng(seed)
+		draws = rng.integers(0, n, size=(resamples, n))
+		boot = np.array([statistics([pages[i] for i in draw]) for draw in draws])
+		standardError = boot.std(axis=0) * math.sqrt(n / (n - 1)) * fpc
+		halfWidths = studentQuantile((1 + confidence) / 2, n - 1) * standardError
+		table['lower'] = estimate - halfWidths
+		table['upper'] = estimate + halfWidths
+	else:
+		return table
+	halfWidth = (table.loc['mean', 'upper'] - table.loc['mean', 'lower']) / 2
+	table.attrs['relativeError'] = float(halfWidth / abs(estimate[0])) if estimate[0] else math.inf
+	return table
+
+@dataclass(frozen=True)
+class SearchQuery:
+	"""
+	Immutable description of a single search results page request on the Chrono24 website.
+
+	A SearchQuery holds everything needed to request one page (query text, page number, page size and
+	result view). Since it cannot be changed after creation, the same object can safely be passed to
+	several threads or tasks at once; a request for another page or another reference is expressed by
+	deriving a new SearchQuery with 'withPage' or 'withQuery' instead of modifying a shared payload.
+
+	Attributes:
+		query (str): The reference number or model name to search for.
+		showPage (int): The page of search results to be requested, starting at 1.
+		pageSize (int): The number of listings per page.
+		resultview (str): The view in which the results are rendered.
+		extra (tuple): Further search parameters as sorted (key, value) pairs.
+	"""
+	query : str = ''
+	showPage : int = 1
+	pageSize : int = 120
+	resultview : str = 'list'
+	extra : tuple = ()
+
+	@classmethod
+	def fromPayload(cls, payload : dict) -> 'SearchQuery':
+		"""
+		Creates a SearchQuery from a payload dictionary as used by the Chrono class.
+
+		Parameters:
+			payload (dict): The search parameters, e.g. {'query' : '126610LN', 'pageSize' : 120, 'showPage' : 1}.
+
+		Returns:
+			SearchQuery: The immutable query holding the same parameters.
+		"""
+		known = {'query', 'showPage', 'pageSize', 'resultview'}
+		return cls(query=payload.get('query', ''),
+				   showPage=payload.get('showPage', 1),
+				   pageSize=payload.get('pageSize', 120),
+				   resultview=payload.get('resultview', 'list'),
+				   extra=tuple(sorted((k, v) for k, v in payload.items() if k not in known)))
+
+	def toPayload(self) -> dict:
+		"""
+		Converts the query into the request parameters expected by the Chrono24 search.
+
+		Returns:
+			dict: A new dictionary with the search parameters of this query.
+		"""
+		payload = {'query' : self.query, 'pageSize' : self.pageSize, 'resultview' : self.resultview, 'showPage' : self.showPage}
+		payload.update(self.extra)
+		return payload
+
+	def withPage(self, page : int) -> 'SearchQuery':
+		"""
+		Derives a query for another page of the same search.
+
+		Parameters:
+			page (int): The page number to be requested.
+
+		Returns:
+			SearchQuery: A new query that differs from this one only in the page number.
+		"""
+		return replace(self, showPage=page)
+
+	def withQuery(self, query : str) -> 'SearchQuery':
+		"""
+		Derives a query for another reference or model name, starting at the first page.
+
+		Parameters:
+			query (str): The new search text.
+
+		Returns:
+			SearchQuery: A new query for the first page of the given search text.
+		"""
+		return replace(self, query=query, showPage=1)
+
+	def withParameter(self, key : str, value) -> 'SearchQuery':
+		"""
+		Derives a query with an additional (or changed) search parameter, starting at the first page.
+
+		Parameters:
+			key (str): The name of the search parameter, e.g. 'sortorder'.
+			value: The value of the search parameter.
+
+		Returns:
+			SearchQuery: A new query for the first page with the given parameter set.
+		"""
+		extra = dict(self.extra)
+		extra[key] = value
+		return replace(self, showPage=1, extra=tuple(sorted(extra.items())))
+
 class Chrono(Driver):
 	"""
 	Extends the Driver class to include specific functionalities for interacting with and scraping 
@@ -160,9 +660,13 @@ class Chrono(Driver):
 		header (dict): HTTP headers to be used in requests.
 		source (str): Base URL for the Chrono24 search queries.
 		payload (dict): Default parameters for search queries, including query text, page size, and other settings.
+			Methods that accept a SearchQuery fall back to a snapshot of this payload when no query is given.
 		searchUrl (str): Additional URL parameters to be appended to the base URL for search queries.
 		parser (str): Specifies the parser to be used with BeautifulSoup for parsing HTML content.
+		archive (PageArchive): Optional archive in which every fetched page is stored for offline re-parsing.
 	"""
+	sortPriceAscending = 1 # value of the 'sortorder' search parameter for results sorted by increasing price
+
 	def __init__(self):
 		"""
 		Initializes the Chrono object with default settings specific to scraping data from the Chrono24 website.
@@ -178,6 +682,7 @@ class Chrono(Driver):
 		self.searchUrl = "&dosearch=true&searchexplain=false&watchTypes=U&accessoryTypes="
 		self.searchUrl = "&dosearch=true&searchexplain=false&watchTypes=U&accessoryTypes="
 		self.parser = "html.parser"
+		self.archive = None
 
 	def getSource(self) -> str:
 		"""
@@ -246,6 +751,34 @@ class Chrono(Driver):
 		"""
 		self.payload = payload
 
+	def getQuery(self) -> SearchQuery:
+		"""
+		Creates an immutable snapshot of the current payload.
+
+		The returned SearchQuery is not affected by later calls to 'updateQuery' or 'updatePage', so it can
+		be handed to concurrent requests without the risk of being changed underneath them.
+
+		Returns:
+			SearchQuery: The query described by the current payload.
+		"""
+		return SearchQuery.fromPayload(self.payload)
+
+	def defaultQuery(self) -> SearchQuery:
+		"""
+		Retrieves the query used by the fetching methods when no SearchQuery is passed to them.
+
+		This is a snapshot of the current payload (see 'getQuery'). If the payload does not contain a search
+		text yet, the user is prompted for a reference or model name, which is stored in the payload. Only this
+		interactive path changes the payload; explicitly passed queries never do.
+
+		Returns:
+			SearchQuery: The query described by the current payload.
+		"""
+		if self.getLenFirstEntry() == 0:
+			print("Wich reference you are looking for?\n")
+			self.updateQuery(input())
+		return self.getQuery()
+
 	def getSearchUrl(self) -> str:
 		"""
 		Retrieves additional URL parameters used in search queries.
@@ -288,9 +821,30 @@ class Chrono(Driver):
 		"""
 		self.parser = parser
 
-	def getListingSize(self) -> int:
+	def getArchive(self) -> PageArchive:
+		"""
+		Retrieves the archive in which fetched pages are stored.
+
+		Returns:
+			PageArchive: The archive used for fetched pages, or None if pages are not archived.
+		"""
+		return self.archive
+
+	def setArchive(self, archive : PageArchive):
+		"""
+		Sets the archive in which fetched pages are stored.
+
+		Once an archive is set, the raw HTML of every page fetched by this object is appended to it,
+		so that the pages can later be re-parsed with 'replayArchive' without network access.
+
+		Parameters:
+			archive (PageArchive): The archive to be used, or None to stop archiving pages.
+		"""
+		self.archive = archive
+
+	def getListingSize(self, query : SearchQuery = None, deadline : Deadline = None) -> int:
 		"""
-		Determines the total number of listings available for the current search query on the Chrono24 website.
+		Determines the total number of listings available for the given search query on the Chrono24 website.
 
 		This method fetches the search results page using 'createSoupObject', which returns a BeautifulSoup
 		object. It then searches for an HTML element (specified by a 'strong' tag) that contains the text
@@ -300,23 +854,31 @@ class Chrono(Driver):
 		If the method cannot find the number of listings (e.g., due to changes in the website's HTML structure),
 		it defaults to returning 0.
 
+		Parameters:
+			query (SearchQuery): The search query, defaults to the current payload.
+			deadline (Deadline): Optional deadline for the requests.
+
 		Returns:
-			int: The total number of listings for the current search query. Returns 0 if the number cannot be found.
-		"""
-		result = []
-		while len(result) == 0:
-			soup = createSoupObject(self.getUrlSearchResults(self.getPayload()), self.getHeader(), self.getParser())
-			result = soup.find_all("strong", string=re.compile("listings$"))
-			if len(result) != 0:
+			int: The total number of listings for the search query. Returns 0 if the number cannot be found.
+
+		Raises:
+			DeadlineExceeded: If the deadline expires before the number of listings is found.
+		"""
+		if query is None:
+			query = self.defaultQuery()
+		result = None
+		while result is None:
+			soup = createSoupObject(self.getUrlSearchResults(query, deadline), self.getHeader(), self.getParser(), self.getArchive(), deadline,
+									kind='listingSize')
+			result = parseListingSize(soup)
+			if result is not None:
 				break
 		if result:
-			size_str = result[0].text.split(" ")[0]
-			size_str = size_str.replace(',', '')  # Remove commas from the string
-			return int(size_str)
+			return result
 		else:
 			return 0  # Return 0 if no listing size found
 
-	def calculatePages(self) -> int:
+	def calculatePages(self, query : SearchQuery = None, deadline : Deadline = None) -> int:
 		"""
 		Calculates the total number of pages of search results based on the total number of listings.
 
@@ -327,45 +889,51 @@ class Chrono(Driver):
 		If 'getListingSize' returns 0 or None (indicating no listings are found or an error in fetching the 
 		listing size), this method returns 0, indicating there are no pages of results to process.
 
+		Parameters:
+			query (SearchQuery): The search query, defaults to the current payload.
+			deadline (Deadline): Optional deadline for the requests.
+
 		Returns:
 			int: The total number of pages required to display all search results. Returns 0 if no listings are found.
 		"""
-		results = self.getListingSize()
+		if query is None:
+			query = self.defaultQuery()
+		results = self.getListingSize(query, deadline)
 		if results is None or results == 0:
 			return 0  # Return 0 to indicate no pages to process
-		pageSize = self.getPayload()['pageSize']
+		pageSize = query.pageSize
 		pages = math.ceil(results / pageSize)
 		return pages
 
-	def getUrlSearchResults(self, payload : dict):
+	def getUrlSearchResults(self, query : SearchQuery, deadline : Deadline = None):
 		"""
-		Constructs and retrieves the full URL for the search results based on the given payload.
+		Constructs and retrieves the full URL for the search results based on the given query.
 
-		This method first checks if there is an existing query in the payload. If not, it prompts the
-		user to input a reference or model name, which is then added to the payload. It then makes
-		a GET request to the source URL with the updated payload to construct the full URL for search results.
+		This method makes a GET request to the source URL with the parameters of the query to construct
+		the full URL for search results. Only the given query is read, so concurrent calls with different
+		queries do not interfere. A query without search text is rejected; prompting the user for a
+		reference is left to 'defaultQuery', which is used when no query is passed to the fetching methods.
 
 		Parameters:
-			payload (dict): The search parameters to be included in the query.
+			query (SearchQuery): The search query for which the URL is constructed.
+			deadline (Deadline): Optional deadline for the request.
 
 		Returns:
 			str: The full URL containing the search results.
 
 		Raises:
-			AssertionError: If the payload is empty.
-		"""
-		assert len(payload) != 0
-		if self.getLenFirstEntry() == 0:
-			print("Wich reference you are looking for?\n")
-			self.updateQuery(input())
-			r = requests.get(self.getSource(), headers=self.getHeader(), params=self.getPayload())
-			url = r.url + self.getSearchUrl()
-		else:
-			r = requests.get(self.getSource(), headers=self.getHeader(), params=self.getPayload())
-			url = r.url + self.getSearchUrl()
+			AssertionError: If no query is given.
+			ValueError: If the query has no search text.
+			DeadlineExceeded: If the deadline has expired before the request is made.
+		"""
+		assert query is not None
+		if len(query.query) == 0:
+			raise ValueError("The search query has no reference or model name")
+		r = requests.get(self.getSource(), headers=self.getHeader(), params=query.toPayload(), timeout=requestTimeout(deadline))
+		url = r.url + self.getSearchUrl()
 		return url
 
-	def getLdJson(self) -> dict:
+	def getLdJson(self, query : SearchQuery = None, deadline : Deadline = None) -> dict:
 		"""
 		Retrieves JSON-LD (JavaScript Object Notation for Linked Data) structured data from the search results page.
 
@@ -374,13 +942,19 @@ class Chrono(Driver):
 		data in JSON format. This is common in web pages for providing structured data to search engines
 		and other crawlers.
 
+		Parameters:
+			query (SearchQuery): The page to be fetched, defaults to the current payload.
+			deadline (Deadline): Optional deadline for the requests.
+
 		Returns:
 			dict: A dictionary representing the parsed JSON-LD content from the page.
 		"""
-		soup = createSoupObject(self.getUrlSearchResults(self.getPayload()), self.getHeader(), self.getParser())
-		return json.loads("".join(soup.find("script", {"type" : "application/ld+json"}).contents))
+		if query is None:
+			query = self.defaultQuery()
+		soup = createSoupObject(self.getUrlSearchResults(query, deadline), self.getHeader(), self.getParser(), self.getArchive(), deadline)
+		return parseLdJson(soup)
 
-	def getData(self):
+	def getData(self, query : SearchQuery = None):
 		"""
 		Retrieves structured JSON data from the search results page of the Chrono24 website.
 
@@ -393,46 +967,303 @@ class Chrono(Driver):
 		providing a clear and concise method name for fetching data, abstracting away the specifics 
 		of the JSON-LD extraction.
 
+		Parameters:
+			query (SearchQuery): The page to be fetched, defaults to the current payload.
+
 		Returns:
 			dict: A dictionary representing the JSON-LD structured data extracted from the search results page.
 		"""
-		json = self.getLdJson()
+		json = self.getLdJson(query)
 
-	def loadOffers(self) -> list:
+	def loadOffers(self, query : SearchQuery = None, deadline : Deadline = None) -> list:
 		"""
-		Retrieves the list of offers from the current search results page.
+		Retrieves the list of offers from the given search results page.
 
 		This method utilizes 'getLdJson' to fetch structured JSON data from the webpage,
 		specifically extracting the offers section. The method navigates through the JSON 
 		structure to find the offers listed under the '@graph' key. It is particularly used 
 		for extracting offer data from a single page of search results.
 
+		Parameters:
+			query (SearchQuery): The page to be fetched, defaults to the current payload.
+			deadline (Deadline): Optional deadline for the requests.
+
 		Returns:
-			list: A list containing the offers extracted from the current page. Each offer is represented 
+			list: A list containing the offers extracted from the page. Each offer is represented 
 			as a dictionary within this list.
 		"""
-		results = self.getLdJson()
-		return results['@graph'][1].get('offers')
+		results = self.getLdJson(query, deadline)
+		return extractOffers(results)
+
+	def loadSearchPage(self, query : SearchQuery = None, deadline : Deadline = None) -> tuple:
+		"""
+		Retrieves the offers of a search results page together with the total number of listings shown on it.
+
+		Unlike calling 'getListingSize' and 'loadOffers', this needs a single request, which makes it the cheaper
+		way to load the first page of a search when the number of pages is needed as well.
+
+		Parameters:
+			query (SearchQuery): The page to be fetched, defaults to the current payload.
+			deadline (Deadline): Optional deadline for the requests.
+
+		Returns:
+			tuple: The list of offers of the page and the number of listings of the search (None if not shown).
+		"""
+		if query is None:
+			query = self.defaultQuery()
+		soup = createSoupObject(self.getUrlSearchResults(query, deadline), self.getHeader(), self.getParser(), self.getArchive(), deadline)
+		return extractOffers(parseLdJson(soup)), parseListingSize(soup)
 
-	def loadAllOffers(self) -> list:
+	def loadAllOffers(self, query : SearchQuery = None, deadline : Deadline = None, workers : int = 1) -> list:
 		"""
 		Collects offers from all available pages of search results.
 
-		The method iterates through each page of search results, starting from the second page 
-		(as it assumes the first page's offers are already loaded). For each page, it updates 
-		the search query to fetch offers and appends them to a cumulative list. This method is 
-		useful for scenarios where a complete dataset of offers from all pages is required.
+		The method determines the number of pages and loads every page of search results through 'crawlOffers'. 
+		For each page, it derives a query for that page and adds its offers to a cumulative list. 
+		This method is useful for scenarios where a complete dataset of offers from all pages is required.
+
+		Parameters:
+			query (SearchQuery): The search query, defaults to the current payload.
+			deadline (Deadline): Optional deadline, when it expires the offers collected so far are returned.
+			workers (int): Number of pages fetched concurrently.
 
 		Returns:
-			list: A consolidated list containing offers from all pages. Each offer is a dictionary.
+			list: A consolidated list containing offers from all (fetched) pages. Each offer is a dictionary.
 		"""
-		results : list = self.loadOffers()
-		for i in range(2, self.calculatePages() + 1):
-			self.updatePage(i)
-			results.append(self.loadOffers())
+		results, coverage = self.crawlOffers(query, deadline, workers)
 		return results
 
-	def tableOffersRaw(self):
+	def crawlOffers(self, query : SearchQuery = None, deadline : Deadline = None, workers : int = 1) -> tuple:
+		"""
+		Collects offers from all pages of search results within an optional time budget.
+
+		The first page is loaded with 'loadSearchPage', which also yields the number of listings and thus the
+		number of pages, after which the remaining pages are fetched by a pool of worker threads. When the deadline expires, the crawl stops waiting: the deadline is cancelled so that
+		no further requests are started, requests still in flight are abandoned (they are bounded by their
+		timeout), and the offers of the pages fetched so far are returned together with coverage metadata.
+		A page that fails (e.g. a connection error or a page that cannot be parsed) does not stop the crawl,
+		it is recorded in the coverage metadata instead.
+
+		Parameters:
+			query (SearchQuery): The search query, defaults to the current payload.
+			deadline (Deadline): Optional deadline for the crawl. Without a deadline all pages are fetched.
+			workers (int): Number of pages fetched concurrently.
+
+		Returns:
+			tuple: A list with the offers of the fetched pages (in page order) and a coverage dictionary with the keys
+			'pagesFetched', 'pagesTotal' (None if the first page could not be loaded in time, failed or did not show
+			the number of listings), 'pagesFailed', 'failures' (error message per failed page), 'complete' and 'elapsed' (seconds).
+		"""
+		start = time.monotonic()
+		if query is None:
+			query = self.defaultQuery()
+		if deadline is None:
+			deadline = Deadline()
+		pages, failures, total = {}, {}, None
+		try:
+			pages[1], listings = self.loadSearchPage(query.withPage(1), deadline)
+			total = max(1, math.ceil(listings / query.pageSize)) if listings is not None else None
+		except (DeadlineExceeded, requests.exceptions.Timeout):
+			pass
+		except Exception as e:
+			failures[1] = f"{type(e).__name__}: {e}"
+
+		if total:
+			loaded, failed = self.loadPages(query, range(2, total + 1), deadline, workers)
+			pages.update(loaded)
+			failures.update(failed)
+
+		results = []
+		for page in sorted(pages):
+			results.extend(pages[page])
+		coverage = {'pagesFetched' : len(pages),
+					'pagesTotal' : total,
+					'pagesFailed' : len(failures),
+					'failures' : failures,
+					'complete' : total is not None and len(pages) == total,
+					'elapsed' : time.monotonic() - start}
+		return results, coverage
+
+	def loadPages(self, query : SearchQuery, pages, deadline : Deadline = None, workers : int = 1) -> tuple:
+		"""
+		Loads the offers of several pages of a search concurrently within an optional time budget.
+
+		When the deadline expires before all pages are loaded, it is cancelled so that no further requests are
+		started, and only the pages loaded so far are returned. Pages that fail with any other error are
+		reported separately, so that the pages loaded successfully are kept.
+
+		Parameters:
+			query (SearchQuery): The search query.
+			pages (iterable): The page numbers to be loaded.
+			deadline (Deadline): Optional deadline for the requests.
+			workers (int): Number of pages fetched concurrently.
+
+		Returns:
+			tuple: A dictionary with the offers of every page that could be loaded and a dictionary with the error
+			message of every page that failed, both keyed by page number. Pages that were not loaded because the
+			deadline expired appear in neither.
+		"""
+		if deadline is None:
+			deadline = Deadline()
+		loaded = {}
+		failures = {}
+		executor = ThreadPoolExecutor(max_workers=max(1, workers))
+		futures = {executor.submit(self.loadOffers, query.withPage(page), deadline) : page for page in pages}
+		done, pending = wait(futures, timeout=deadline.remaining())
+		if pending:
+			deadline.cancel()
+		executor.shutdown(wait=False, cancel_futures=True)
+		for future in done:
+			try:
+				loaded[futures[future]] = future.result() or []
+			except (DeadlineExceeded, requests.exceptions.Timeout):
+				pass
+			except Exception as e:
+				failures[futures[future]] = f"{type(e).__name__}: {e}"
+		return loaded, failures
+
+	def estimateStatistics(self, query : SearchQuery = None, precision : float = 0.05, confidence : float = 0.95,
+						   quantiles : tuple = (0.25, 0.5, 0.75), initialPages : int = 3, batchPages : int = 2,
+						   minPages : int = 3, deadline : Deadline = None, workers : int = 1, seed : int = None):
+		"""
+		Estimates the price distribution of a search from a random sample of its pages.
+
+		Instead of fetching every page, the number of pages is derived from 'getListingSize' and pages are drawn
+		at random without replacement. After each batch the mean and the requested quantiles are estimated together
+		with confidence intervals (see 'estimatePriceStatistics'). Further batches are fetched until the half width
+		of the confidence interval of the mean, relative to the mean, is at most 'precision' (based on at least
+		'minPages' pages with prices, as intervals from fewer pages are unreliable), all pages were fetched, or the
+		deadline expires. If the deadline expires before the number of listings is known, an empty estimate is returned.
+
+		Parameters:
+			query (SearchQuery): The search query, defaults to the current payload.
+			precision (float): Target relative half width of the confidence interval of the mean (e.g. 0.05 for +/- 5%).
+			confidence (float): Confidence level of the intervals.
+			quantiles (tuple): The quantiles to be estimated.
+			initialPages (int): Number of pages in the first sample.
+			batchPages (int): Number of pages added to the sample per further step.
+			minPages (int): Minimum number of pages with prices before the target precision may end the sampling.
+			deadline (Deadline): Optional time budget for the estimation.
+			workers (int): Number of pages fetched concurrently.
+			seed (int): Optional seed for the random selection of pages.
+
+		Returns:
+			pandas.DataFrame: The estimates with the columns 'estimate', 'lower' and 'upper', indexed by statistic
+			('mean' and the quantiles, e.g. '50%'). The 'attrs' of the DataFrame hold the sampling metadata:
+			'listings', 'pagesTotal', 'pagesFetched', 'pagesPriced', 'sampleSize', 'confidence', 'relativeError',
+			'pagesFailed', 'failures' (error message per page that could not be loaded, these pages are not part of
+			the sample) and 'complete' (True if the target precision was reached or all pages were fetched). 'listings'
+			and 'pagesTotal' are None if the number of listings could not be determined in time.
+		"""
+		if query is None:
+			query = self.defaultQuery()
+		if deadline is None:
+			deadline = Deadline()
+		try:
+			listings = self.getListingSize(query, deadline)
+		except (DeadlineExceeded, requests.exceptions.Timeout):
+			table = estimatePriceStatistics([], None, confidence, quantiles, seed)
+			table.attrs.update({'listings' : None, 'pagesFailed' : 0, 'failures' : {}, 'complete' : False})
+			return table
+		total = math.ceil(listings / query.pageSize) if listings else 0
+		order = random.Random(seed).sample(range(1, total + 1), total)
+
+		pagePrices = {}
+		failures = {}
+		table = estimatePriceStatistics([], total, confidence, quantiles, seed)
+		while order and not deadline.expired():
+			size = batchPages if pagePrices else initialPages
+			batch, order = order[:size], order[size:]
+			loaded, failed = self.loadPages(query, batch, deadline, workers)
+			failures.update(failed)
+			for page, offers in loaded.items():
+				pagePrices[page] = [price for price in map(offerPrice, flatten_list_of_dicts(offers)) if price is not None]
+			table = estimatePriceStatistics(list(pagePrices.values()), total, confidence, quantiles, seed)
+			if table.attrs['relativeError'] <= precision and table.attrs['pagesPriced'] >= minPages:
+				break
+		precise = table.attrs['relativeError'] <= precision and table.attrs['pagesPriced'] >= minPages
+		table.attrs.update({'listings' : listings, 'pagesFailed' : len(failures), 'failures' : failures,
+							'complete' : len(pagePrices) == total or precise})
+		return table
+
+	def cheapestOffers(self, k : int = 20, query : SearchQuery = None, deadline : Deadline = None):
+		"""
+		Retrieves the k cheapest offers of a search, fetching as few pages as possible.
+
+		The search results are requested sorted by increasing price, and the k cheapest offers seen so far are kept
+		in a bounded heap. Pagination stops as soon as the heap is full and the most expensive offer of the current page
+		is not cheaper than the k-th cheapest offer, since all later pages can only contain more expensive offers.
+		If a page turns out not to be sorted by price, this early termination is disabled and the remaining pages are
+		scanned, so the result stays correct. Pagination never goes beyond the number of pages derived from the listing
+		count shown on the first page. Offers without a price (price on request) are ignored.
+
+		Parameters:
+			k (int): The number of offers to be returned, at least 1.
+			query (SearchQuery): The search query, defaults to the current payload.
+			deadline (Deadline): Optional time budget, when it expires the cheapest offers found so far are returned.
+
+		Returns:
+			pandas.DataFrame: The (at most) k cheapest offers sorted by price, as returned by 'tableOffers', but keeping
+			offers with missing optional fields. The 'coverage' entry of the 'attrs' holds 'pagesFetched', 'pagesTotal'
+			(None if the first page does not show the listing count), 'complete' and 'elapsed' (seconds).
+
+		Raises:
+			ValueError: If k is smaller than 1.
+		"""
+		if k < 1:
+			raise ValueError(f"k must be at least 1, got {k}")
+		start = time.monotonic()
+		if query is None:
+			query = self.defaultQuery()
+		query = query.withParameter('sortorder', self.sortPriceAscending)
+		heap = [] # (-price, position, offer), the most expensive of the k cheapest offers on top
+		position = 0
+		previousMax = -math.inf
+		ordered = True
+		complete = False
+		total = None
+		limit = 1 # pages that may be fetched, raised to the number of pages once the first page shows it
+		fetched = 0
+		while fetched < limit:
+			try:
+				if fetched == 0:
+					offers, listings = self.loadSearchPage(query, deadline)
+					if listings is not None:
+						total = limit = math.ceil(listings / query.pageSize)
+				else:
+					offers = self.loadOffers(query.withPage(fetched + 1), deadline)
+			except (DeadlineExceeded, requests.exceptions.Timeout):
+				break
+			fetched += 1
+			offers = flatten_list_of_dicts(offers or [])
+			prices = []
+			for offer in offers:
+				price = offerPrice(offer)
+				if price is None:
+					continue
+				prices.append(price)
+				position += 1
+				if len(heap) < k:
+					heapq.heappush(heap, (-price, position, offer))
+				elif price < -heap[0][0]:
+					heapq.heapreplace(heap, (-price, position, offer))
+			if prices:
+				ordered = ordered and prices == sorted(prices) and prices[0] >= previousMax
+				previousMax = max(previousMax, prices[-1])
+			if len(offers) < query.pageSize or (ordered and len(heap) == k and prices and prices[-1] >= -heap[0][0]):
+				complete = True
+				break
+		else:
+			complete = total is not None
+
+		cheapest = [offer for price, position, offer in sorted(heap, key=lambda entry : (-entry[0], entry[1]))]
+		table = buildOffersTable(cheapest, dropIncomplete=False)
+		table.attrs['coverage'] = {'pagesFetched' : fetched,
+								   'pagesTotal' : total,
+								   'complete' : complete, 'elapsed' : time.monotonic() - start}
+		return table
+
+	def tableOffersRaw(self, query : SearchQuery = None):
 		"""
 		Converts the list of offers into a raw pandas DataFrame.
 
@@ -441,19 +1272,25 @@ class Chrono(Driver):
 		for easier analysis and manipulation. The DataFrame format is useful for data analysis tasks,
 		allowing application of various data transformation and filtering operations.
 
+		Parameters:
+			query (SearchQuery): The page to be fetched, defaults to the current payload.
+
 		Returns:
 			pandas.DataFrame: A DataFrame containing the raw offer data.
 		"""
-		dict_data = self.loadOffers()
+		dict_data = self.loadOffers(query)
 		return pd.json_normalize(dict_data)
 
-	def tableOffers(self, all : bool = False):
+	def tableOffers(self, all : bool = False, query : SearchQuery = None, deadline : Deadline = None, workers : int = 1):
 		"""
 		Converts offers into a structured pandas DataFrame with an option to include data from all pages.
 
 		Parameters:
 			all (bool): A flag to determine if the method should fetch offers from all pages (True) or 
 			just the current page (False).
+			query (SearchQuery): The search query, defaults to the current payload.
+			deadline (Deadline): Optional time budget. When it expires, the offers collected so far are returned.
+			workers (int): Number of pages fetched concurrently when fetching all pages.
 
 		This method decides based on the 'all' parameter whether to fetch offers from all pages or just the current one.
 		It uses either 'loadAllOffers' or 'loadOffers' accordingly. After obtaining the data, it normalizes the list of 
@@ -461,28 +1298,32 @@ class Chrono(Driver):
 		attempts to convert the 'price' column to integers. This method is especially useful for preparing the data for 
 		downstream analysis tasks.
 
+		How much of the search was covered is stored in the 'coverage' entry of the DataFrame's 'attrs'
+		(see 'crawlOffers'), which tells whether the result is partial because the deadline expired.
+
 		Returns:
 			pandas.DataFrame: A DataFrame containing structured and potentially cleaned offer data.
 		"""
 		dict_data = {}
 		if all:
-			dict_data = self.loadAllOffers()
+			dict_data, coverage = self.crawlOffers(query, deadline, workers)
 			# print(type(dict_data))
 			# run inspect for debugging purposes, when facing data structure problems during flattening
 			# inspect_data_structure(dict_data)
 			# inspect_non_dict_elements(dict_data, [120])
-			flattened_dict_data = flatten_list_of_dicts(dict_data)
-			table = pd.json_normalize(flattened_dict_data)
-			table = table.dropna(axis=0)
 		else:
-			dict_data = self.loadOffers()
+			start = time.monotonic()
+			fetched = False
+			try:
+				dict_data = self.loadOffers(query, deadline)
+				fetched = True
+			except (DeadlineExceeded, requests.exceptions.Timeout):
+				dict_data = []
 			# print(dict_data)
-			table = pd.json_normalize(dict_data)
-			table = table.dropna(axis=0)
-		try:
-			table['price'] = table['price'].astype(int)
-		except KeyError as e:
-			print('Price column not available, hence the price is on request')
+			coverage = {'pagesFetched' : int(fetched), 'pagesTotal' : 1,
+						'complete' : fetched, 'elapsed' : time.monotonic() - start}
+		table = buildOffersTable(dict_data)
+		table.attrs['coverage'] = coverage
 		return table
 
 	def getLenFirstEntry(self) -> int:
@@ -495,7 +1336,7 @@ class Chrono(Driver):
 
 	def updateQuery(self, query : str) -> None:
 		"""
-		Updates the search query in the payload.
+		Updates the search query in the payload. Queries already obtained through 'getQuery' are not affected.
 		Parameters:
 		query (str): The new search query to be set.
 		"""
@@ -503,12 +1344,242 @@ class Chrono(Driver):
 
 	def updatePage(self, page : int) -> None:
 		"""
-		Updates the payload to request a specific page of search results.
+		Updates the payload to request a specific page of search results. Queries already obtained through 
+		'getQuery' are not affected.
 		Parameters:
 		page (int): The page number to be set in the payload.
 		"""
 		self.payload.update({'showPage' : page})
 
+class WorkQueue:
+	"""
+	Durable work queue of (query, page) tasks for crawling searches with several worker processes or machines.
+
+	The queue is a SQLite database file. A coordinator submits searches, workers lease tasks, fetch the page and
+	report the offers back, and the coordinator merges the results. All processes only need access to the same
+	database file, so the workers can run in several processes or containers. SQLite relies on file locks, so the
+	file must be on a filesystem with working POSIX locking (e.g. a local disk mounted into the containers);
+	network shares such as NFS or SMB often do not lock reliably and can corrupt the queue.
+
+	After submitting its searches, the coordinator closes the queue. Workers wait for tasks until the queue is
+	closed and all tasks are done or failed, so workers may be started before the coordinator.
+
+	Every search starts as a single task for its first page. The worker that completes the first page also reports
+	the number of pages of the search (from the listing count shown on it), upon which tasks for the remaining pages
+	are added. Leases expire after a timeout: a task whose worker crashed or stalled becomes available again and is
+	taken over by the next idle worker. Tasks that failed 'maxAttempts' times are marked as failed instead of being
+	retried forever. The limit is stored in the queue file, so that all workers apply the one set by the coordinator.
+
+	Attributes:
+		path (str): Path of the SQLite database file.
+		defaultMaxAttempts (int): Number of leases after which a failing task is given up, unless set otherwise.
+	"""
+	defaultMaxAttempts = 3
+
+	def __init__(self, path : str, maxAttempts : int = None):
+		"""
+		Opens the queue at the given path, creating the database file and its table if necessary.
+
+		Parameters:
+			path (str): Path of the SQLite database file.
+			maxAttempts (int): Number of leases after which a task that did not complete is marked as failed. If given,
+			it is stored in the queue file for all workers, otherwise the stored (or default) limit is used.
+		"""
+		self.path = path
+		with closing(self.connect()) as db:
+			db.execute("""CREATE TABLE IF NOT EXISTS tasks (
+				id INTEGER PRIMARY KEY,
+				query TEXT NOT NULL,
+				page INTEGER NOT NULL,
+				state TEXT NOT NULL DEFAULT 'pending',
+				worker TEXT,
+				leaseExpires REAL,
+				attempts INTEGER NOT NULL DEFAULT 0,
+				result TEXT,
+				error TEXT,
+				UNIQUE (query, page))""")
+			db.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
+			if maxAttempts is not None:
+				db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('maxAttempts', ?)", (str(maxAttempts),))
+
+	def getMaxAttempts(self, db : sqlite3.Connection) -> int:
+		"""
+		Retrieves the number of leases after which a task that did not complete is marked as failed.
+
+		Parameters:
+			db (sqlite3.Connection): An open connection to the queue database.
+
+		Returns:
+			int: The limit stored in the queue file, or 'defaultMaxAttempts' if none was set.
+		"""
+		row = db.execute("SELECT value FROM settings WHERE key = 'maxAttempts'").fetchone()
+		return int(row[0]) if row is not None else self.defaultMaxAttempts
+
+	def connect(self) -> sqlite3.Connection:
+		"""
+		Opens a new connection to the queue database. Transactions are started explicitly, and concurrent
+		writers wait for each other instead of failing immediately.
+
+		Returns:
+			sqlite3.Connection: The connection to the database.
+		"""
+		return sqlite3.connect(self.path, timeout=60, isolation_level=None)
+
+	def submit(self, query : SearchQuery) -> None:
+		"""
+		Adds a search to the queue, starting with the task for its first page. Submitting the same search twice has no effect.
+		Submitting reopens a closed queue until 'close' is called again.
+
+		Parameters:
+			query (SearchQuery): The search to be crawled.
+		"""
+		with closing(self.connect()) as db:
+			db.execute("BEGIN IMMEDIATE")
+			db.execute("INSERT OR IGNORE INTO tasks (query, page) VALUES (?, 1)", (queryKey(query),))
+			db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('closed', '0')")
+			db.execute("COMMIT")
+
+	def close(self) -> None:
+		"""
+		Marks that no further searches will be submitted, so that workers stop once all tasks are done or failed.
+		"""
+		with closing(self.connect()) as db:
+			db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('closed', '1')")
+
+	def isClosed(self) -> bool:
+		"""
+		Checks whether the coordinator has closed the queue.
+
+		Returns:
+			bool: True if no further searches will be submitted, False otherwise.
+		"""
+		with closing(self.connect()) as db:
+			row = db.execute("SELECT value FROM settings WHERE key = 'closed'").fetchone()
+		return row is not None and row[0] == '1'
+
+	def lease(self, worker : str, leaseSeconds : float) -> tuple:
+		"""
+		Leases the next available task: a pending task, or a leased task whose lease has expired.
+
+		Parameters:
+			worker (str): Identifier of the worker taking the task.
+			leaseSeconds (float): Time in seconds after which the task may be taken over by another worker.
+
+		Returns:
+			tuple: The task id and the SearchQuery for the page to be fetched, or None if no task is available.
+		"""
+		now = time.time()
+		with closing(self.connect()) as db:
+			db.execute("BEGIN IMMEDIATE")
+			db.execute("UPDATE tasks SET state = 'failed', worker = NULL WHERE state = 'leased' AND leaseExpires < ? AND attempts >= ?",
+					   (now, self.getMaxAttempts(db)))
+			row = db.execute("""SELECT id, query, page FROM tasks
+				WHERE state = 'pending' OR (state = 'leased' AND leaseExpires < ?)
+				ORDER BY attempts, id LIMIT 1""", (now,)).fetchone()
+			if row is not None:
+				db.execute("UPDATE tasks SET state = 'leased', worker = ?, leaseExpires = ?, attempts = attempts + 1 WHERE id = ?",
+						   (worker, now + leaseSeconds, row[0]))
+			db.execute("COMMIT")
+		if row is None:
+			return None
+		return row[0], SearchQuery.fromPayload(json.loads(row[1])).withPage(row[2])
+
+	def complete(self, taskId : int, worker : str, offers : list, totalPages : int = None) -> bool:
+		"""
+		Stores the offers of a task. For the first page of a search, the tasks for the remaining pages are added.
+
+		A worker whose lease expired may still deliver its result as long as the task is not done, since the
+		page was fetched successfully; the worker that took the task over then finds it done. If the task was
+		already completed, the result is discarded.
+
+		Parameters:
+			taskId (int): The id of the task, as returned by 'lease'.
+			worker (str): Identifier of the worker delivering the result.
+			offers (list): The offers of the page.
+			totalPages (int): The number of pages of the search, required when completing a first page.
+
+		Returns:
+			bool: True if the result was stored, False if the task had already been completed.
+		"""
+		with closing(self.connect()) as db:
+			db.execute("BEGIN IMMEDIATE")
+			stored = db.execute("UPDATE tasks SET state = 'done', worker = ?, result = ?, error = NULL WHERE id = ? AND state != 'done'",
+								(worker, json.dumps(offers), taskId)).rowcount == 1
+			if stored and totalPages:
+				query, page = db.execute("SELECT query, page FROM tasks WHERE id = ?", (taskId,)).fetchone()
+				if page == 1:
+					db.executemany("INSERT OR IGNORE INTO tasks (query, page) VALUES (?, ?)",
+								   [(query, p) for p in range(2, totalPages + 1)])
+			db.execute("COMMIT")
+		return stored
+
+	def fail(self, taskId : int, worker : str, error : str) -> bool:
+		"""
+		Releases a task that could not be completed, so that it is retried (or marked as failed after 'maxAttempts' leases).
+
+		Only the worker currently holding the lease can release the task. A worker whose lease expired and whose
+		task was taken over by another worker cannot interfere with the new lease.
+
+		Parameters:
+			taskId (int): The id of the task, as returned by 'lease'.
+			worker (str): Identifier of the worker that leased the task.
+			error (str): Description of the error.
+
+		Returns:
+			bool: True if the task was released, False if the worker no longer holds the lease.
+		"""
+		with closing(self.connect()) as db:
+			return db.execute("""UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+				worker = NULL, error = ? WHERE id = ? AND state = 'leased' AND worker = ?""",
+				(self.getMaxAttempts(db), error, taskId, worker)).rowcount == 1
+
+	def status(self) -> dict:
+		"""
+		Counts the tasks of the queue by state.
+
+		Returns:
+			dict: The number of tasks per state ('pending', 'leased', 'done' and 'failed').
+		"""
+		counts = {'pending' : 0, 'leased' : 0, 'done' : 0, 'failed' : 0}
+		with closing(self.connect()) as db:
+			counts.update(db.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+		return counts
+
+	def isFinished(self) -> bool:
+		"""
+		Checks whether the queue is closed and all of its tasks are done or failed.
+
+		Returns:
+			bool: True if no further searches will be submitted and no task is pending or leased, False otherwise.
+		"""
+		status = self.status()
+		return self.isClosed() and status['pending'] == 0 and status['leased'] == 0
+
+	def results(self, queries : list = None) -> list:
+		"""
+		Merges the offers of the completed tasks into a single list, ordered by search and page.
+
+		Every offer is tagged with the search text it was found for under the key 'query'. Since a queue file may
+		be reused for several crawls, the searches whose offers are wanted can be given.
+
+		Parameters:
+			queries (list): The searches (SearchQuery) to be merged, defaults to all searches of the queue.
+
+		Returns:
+			list: The offers of the completed pages. Each offer is a dictionary.
+		"""
+		sql = "SELECT query, result FROM tasks WHERE state = 'done'"
+		keys = ()
+		if queries is not None:
+			keys = tuple(dict.fromkeys(queryKey(query) for query in queries))
+			sql += f" AND query IN ({', '.join('?' * len(keys))})"
+		offers = []
+		with closing(self.connect()) as db:
+			for query, result in db.execute(sql + " ORDER BY query, page", keys):
+				search = json.loads(query).get('query')
+				offers.extend(dict(offer, query=search) for offer in flatten_list_of_dicts(json.loads(result)))
+		return offers
+
 class Menu:
 	"""
 	Handles user interactions, providing a menu for input and choices.
@@ -570,6 +1641,19 @@ class Menu:
 		data_choice = input("Do you want to retrieve all data? (yes for all data / no for first page only): ").strip().lower()
 		return data_choice == 'yes'
 
+	def get_approximate_choice(self) -> bool:
+		"""
+		Asks the user whether approximate statistics from a random sample of pages are sufficient.
+
+		Approximate statistics only describe the price distribution (mean and quartiles with confidence intervals),
+		but need only a fraction of the requests of fetching all pages.
+
+		Returns:
+			bool: True if the user wants approximate statistics; False if all listings should be fetched.
+		"""
+		approximate = input("Are approximate price statistics from a sample of pages sufficient? (yes/no): ").strip().lower()
+		return approximate == 'yes'
+
 	def get_save_csv_choice(self) -> str:
 		"""
 		Prompts the user to decide if they want to save the fetched data to a CSV file and, if so, asks for a filename.
@@ -719,7 +1803,180 @@ def flatten_list_of_dicts(data_list):
 			flattened_list.extend(element)
 	return flattened_list
 
-def main() -> None:
+# Memory-mapped view of the archive and parser, set up once per replay worker process
+_replayView = None
+_replayParser = None
+
+def initReplayWorker(path : str, parser : str) -> None:
+	"""
+	Initializes a replay worker process by memory-mapping the archive file.
+
+	Args:
+	path (str): Path of the archive file.
+	parser (str): Parser to be used by BeautifulSoup.
+	"""
+	global _replayView, _replayParser
+	with open(path, 'rb') as f:
+		_replayView = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+	_replayParser = parser
+
+def replayRecord(record : dict) -> list:
+	"""
+	Re-parses a single archived page and extracts its offers.
+
+	Every offer is tagged with the time the page was fetched ('fetched') and the URL of the page ('pageUrl'),
+	so that offers from pages archived at different times can be told apart.
+
+	Args:
+	record (dict): The index record of the page.
+
+	Returns:
+	list: The offers of the page, or an empty list if the page holds no offers (e.g. a page that failed to load).
+	"""
+	soup = BeautifulSoup(readArchiveMember(_replayView, record), _replayParser)
+	try:
+		offers = flatten_list_of_dicts(extractOffers(parseLdJson(soup)) or [])
+	except (AttributeError, IndexError, KeyError, ValueError):
+		return []
+	return [dict(offer, fetched=record.get('fetched'), pageUrl=record.get('url')) for offer in offers]
+
+def replayArchive(path : str, parser : str = "html.parser", processes : int = None, distinct : bool = True):
+	"""
+	Re-runs the offer extraction of 'getLdJson'/'tableOffers' over all pages of an archive, without network access.
+
+	The pages are parsed in parallel by a pool of worker processes, each of which memory-maps the archive
+	once and decompresses the pages it is given directly from their offsets in the index. Pages that were only
+	fetched to count the listings (see 'getListingSize') are skipped, so that no page is counted twice.
+
+	Args:
+	path (str): Path of the archive file written by a PageArchive.
+	parser (str): Parser to be used by BeautifulSoup.
+	processes (int): Number of worker processes. Defaults to the number of CPU cores.
+	distinct (bool): If True, pages whose content was archived more than once are only parsed once.
+
+	Returns:
+	pandas.DataFrame: A DataFrame containing the offers of all archived pages, as returned by 'tableOffers', with the
+	additional columns 'fetched' and 'pageUrl'.
+	"""
+	records = [r for r in PageArchive(path).records() if r.get('kind', 'offers') == 'offers']
+	if distinct:
+		seen = set()
+		records = [r for r in records if not (r['digest'] in seen or seen.add(r['digest']))]
+	if not records:
+		return buildOffersTable([])
+	with multiprocessing.Pool(processes, initializer=initReplayWorker, initargs=(path, parser)) as pool:
+		offers = pool.map(replayRecord, records, chunksize=max(1, len(records) // (4 * (processes or os.cpu_count() or 1))))
+	return buildOffersTable(offers)
+
+def queryKey(query : SearchQuery) -> str:
+	"""
+	Serializes a search (independent of its page) for storage in a WorkQueue.
+
+	Args:
+	query (SearchQuery): The search to be serialized.
+
+	Returns:
+	str: The JSON representation of the search parameters of the first page.
+	"""
+	return json.dumps(query.withPage(1).toPayload(), sort_keys=True)
+
+def runWorker(queuePath : str, worker : str = None, leaseSeconds : float = 120, pollSeconds : float = 1,
+			  chrono = None, archive : str = None, idleTimeout : float = None) -> int:
+	"""
+	Processes tasks of a WorkQueue until the queue is closed and all tasks are done or failed.
+
+	A worker started before the coordinator has submitted its searches waits for them. With an idle timeout,
+	the worker also stops once it had nothing to do for that long.
+
+	Each leased page is fetched within a deadline equal to the lease time, so that a task is either reported
+	back before its lease expires or released for another worker. A first page also determines the number of
+	pages of its search from the listing count shown on it, so that the tasks for the remaining pages can be
+	added to the queue. A first page without a listing count fails, as the search cannot be crawled completely.
+
+	Args:
+	queuePath (str): Path of the queue database file.
+	worker (str): Identifier of the worker, defaults to '<hostname>-<pid>'.
+	leaseSeconds (float): Lease time per task in seconds.
+	pollSeconds (float): Waiting time in seconds when no task is available but others are still leased.
+	chrono (Chrono): The Chrono object used for fetching, a new one is created if not given.
+	archive (str): Optional path of an archive in which all fetched pages are stored (one archive per worker).
+	idleTimeout (float): Optional time in seconds without any available task after which the worker stops.
+
+	Returns:
+	int: The number of tasks completed by this worker.
+	"""
+	queue = WorkQueue(queuePath)
+	worker = worker or f"{platform.node()}-{os.getpid()}"
+	if chrono is None:
+		chrono = Chrono()
+	if archive:
+		chrono.setArchive(PageArchive(archive))
+	completed = 0
+	idleSince = time.monotonic()
+	while True:
+		task = queue.lease(worker, leaseSeconds)
+		if task is None:
+			if queue.isFinished() or (idleTimeout is not None and time.monotonic() - idleSince >= idleTimeout):
+				return completed
+			time.sleep(pollSeconds)
+			continue
+		idleSince = time.monotonic()
+		taskId, query = task
+		deadline = Deadline(leaseSeconds)
+		try:
+			totalPages = None
+			if query.showPage == 1:
+				offers, listings = chrono.loadSearchPage(query, deadline)
+				if listings is None:
+					raise ValueError("The first page does not show the number of listings")
+				totalPages = math.ceil(listings / query.pageSize)
+			else:
+				offers = chrono.loadOffers(query, deadline)
+			offers = offers or []
+		except Exception as e:
+			queue.fail(taskId, worker, f"{type(e).__name__}: {e}")
+			continue
+		if queue.complete(taskId, worker, offers, totalPages):
+			completed += 1
+
+def runCoordinator(queuePath : str, queries : list, workers : int = 0, pollSeconds : float = 2, **workerOptions):
+	"""
+	Submits searches to a WorkQueue, waits until they are crawled and merges the results.
+
+	Workers may be started separately, before or after the coordinator, in any process or container with access to
+	the queue file ('python main.py worker <queue>'); additionally, a number of local worker processes can be started by the coordinator itself. Since the queue is
+	durable, an interrupted crawl is resumed by running the coordinator again with the same queue file.
+
+	Args:
+	queuePath (str): Path of the queue database file.
+	queries (list): The searches (SearchQuery) to be crawled.
+	workers (int): Number of local worker processes to be started.
+	pollSeconds (float): Interval in seconds between progress checks.
+	workerOptions: Further keyword arguments for 'runWorker' of the local workers (e.g. leaseSeconds).
+
+	Returns:
+	pandas.DataFrame: The offers of the given searches with a 'query' column, as returned by 'tableOffers'. Offers
+	of other searches stored in the same queue file are left out. The 'attrs' hold the final 'status' of the queue,
+	which shows how many pages failed.
+	"""
+	queue = WorkQueue(queuePath)
+	for query in queries:
+		queue.submit(query)
+	queue.close()
+	processes = [multiprocessing.Process(target=runWorker, args=(queuePath,), kwargs=workerOptions) for i in range(workers)]
+	for process in processes:
+		process.start()
+	while not queue.isFinished():
+		if processes and not any(process.is_alive() for process in processes):
+			break # all local workers stopped, return what has been crawled so far
+		time.sleep(pollSeconds)
+	for process in processes:
+		process.join()
+	table = buildOffersTable(queue.results(queries))
+	table.attrs['status'] = queue.status()
+	return table
+
+def main(archive : str = None, timeBudget : float = None) -> None:
 	"""
 	The main function serves as the entry point for the program. It orchestrates the overall workflow of the application,
 	facilitating user interactions and processing data based on user inputs.
@@ -728,7 +1985,8 @@ def main() -> None:
 		1. Displays search options to the user and captures their choice.
 		2. Based on the user's choice, prompts for further input (model name or reference number).
 		3. Updates the search query in the Chrono object with the user's input.
-		4. Asks the user whether they want to retrieve data from all pages or just the first page.
+		4. Asks the user whether they want to retrieve data from all pages or just the first page, and for all pages
+		   whether approximate statistics from a random sample of pages are sufficient.
 		5. Fetches the watch data as per the user's choice and prints it.
 		6. Asks the user if they want to save the fetched data to a CSV file. If yes, saves the data.
 		7. Finally, asks the user if they wish to continue with another search or exit.
@@ -743,6 +2001,11 @@ def main() -> None:
 		- Retrieve and display watch data based on user selections.
 		- Optionally save data to a CSV file as per user's request.
 		- Break the loop and exit the program when the user chooses not to continue.
+
+	Parameters:
+		archive (str): Optional path of an archive in which all fetched pages are stored for offline re-parsing.
+		timeBudget (float): Optional time budget in seconds per search. When it is exceeded, the offers collected
+			so far are shown together with the share of pages that could be fetched.
 	"""
 
 	# Start the spinner for initializing for setting up
@@ -750,6 +2013,8 @@ def main() -> None:
 	spinner_thread = start_spinner(stop_event)
 	
 	chrono = Chrono()
+	if archive:
+		chrono.setArchive(PageArchive(archive))
 
 	# Stop the spinner after driver is set up
 	stop_spinner(stop_event, spinner_thread)
@@ -765,17 +2030,50 @@ def main() -> None:
 		if search_input:
 			chrono.updateQuery(search_input)
 			all_data = menu.get_data_retrieval_choice()
+			approximate = all_data and menu.get_approximate_choice()
 
 			# Start the spinner thread before fetching data
 			stop_event = threading.Event()
 			spinner_thread = start_spinner(stop_event)
 
+			deadline = Deadline(timeBudget) if timeBudget else None
+			if approximate:
+				# Estimate the price distribution from a sample of pages
+				statistics = chrono.estimateStatistics(deadline=deadline)
+				stop_spinner(stop_event, spinner_thread)
+
+				info = statistics.attrs
+				print(f"Estimated from {info['sampleSize']} listings on {info['pagesFetched']} of {info['pagesTotal'] or 'unknown'} pages "
+					  f"({info['confidence']:.0%} confidence intervals, relative error of the mean {info['relativeError']:.1%})")
+				if info['pagesFailed']:
+					print(f"{info['pagesFailed']} sampled pages could not be loaded and are not part of the estimate")
+				print(statistics)
+
+				filename = menu.get_save_csv_choice()
+				if filename:
+					statistics.to_csv(filename + '.csv')
+					print(f"Data saved to {filename}.csv")
+				if not menu.ask_to_continue():
+					print("Programme exited. Thanks for using!")
+					break
+				continue
+
 			# Fetch watch data
-			watch_data = chrono.tableOffers(all=all_data)[['name', 'price']]
+			offers = chrono.tableOffers(all=all_data, deadline=deadline)
+			coverage = offers.attrs['coverage']
 
 			# Stop the spinner after data is fetched
 			stop_spinner(stop_event, spinner_thread)		
 
+			if offers.empty:
+				print("No offers could be retrieved.")
+				continue
+			watch_data = offers[['name', 'price']]
+			if coverage.get('pagesFailed'):
+				print(f"{coverage['pagesFailed']} pages could not be loaded: {coverage['failures']}")
+			if not coverage['complete']:
+				print(f"Partial result from {coverage['pagesFetched']} of {coverage['pagesTotal'] or 'unknown'} pages")
+
 			print(watch_data)
 			print(watch_data.describe())
 
@@ -791,6 +2089,80 @@ def main() -> None:
 			print("Programme exited. Thanks for using!")
 			break
 
+def cli(argv : list = None) -> None:
+	"""
+	Parses the command line arguments and starts the requested mode of the program.
+
+	Without a command the interactive menu is started. The 'replay' command re-parses an archive
+	written with '--archive' and prints (and optionally saves) the resulting offers. The 'cheapest'
+	command prints the cheapest offers for a reference or model name. The 'coordinator' and 'worker'
+	commands crawl searches with several processes or machines sharing a WorkQueue file.
+
+	Parameters:
+		argv (list): The command line arguments, defaults to sys.argv[1:].
+	"""
+	parser = argparse.ArgumentParser(description="Web Scraping Program for Chrono24 Luxury Watches")
+	parser.add_argument('--archive', help="store every fetched page in this compressed archive file")
+	parser.add_argument('--time-budget', type=float, default=None, help="maximum time in seconds per search, partial results are shown when exceeded")
+	commands = parser.add_subparsers(dest='command')
+	replay = commands.add_parser('replay', help="re-parse an archive offline")
+	replay.add_argument('path', help="archive file to be re-parsed")
+	replay.add_argument('--processes', type=int, default=None, help="number of worker processes (default: all cores)")
+	replay.add_argument('--csv', help="save the offers to this CSV file (without extension)")
+	cheapest = commands.add_parser('cheapest', help="show the cheapest offers for a reference or model name")
+	cheapest.add_argument('query', help="reference number or model name, e.g. 126610LN")
+	cheapest.add_argument('-k', type=int, default=20, help="number of offers (default: 20)")
+	cheapest.add_argument('--csv', help="save the offers to this CSV file (without extension)")
+	coordinator = commands.add_parser('coordinator', help="crawl searches with workers sharing a queue file")
+	coordinator.add_argument('queue', help="queue database file, shared with the workers")
+	coordinator.add_argument('queries', nargs='+', help="reference numbers or model names to be crawled")
+	coordinator.add_argument('--workers', type=int, default=0, help="number of local worker processes (default: 0)")
+	coordinator.add_argument('--lease', type=float, default=120, help="lease time per task in seconds for local workers")
+	coordinator.add_argument('--csv', help="save the offers to this CSV file (without extension)")
+	worker = commands.add_parser('worker', help="process tasks of a queue file until it is finished")
+	worker.add_argument('queue', help="queue database file, shared with the coordinator")
+	worker.add_argument('--lease', type=float, default=120, help="lease time per task in seconds")
+	worker.add_argument('--idle-timeout', type=float, default=None, help="stop after this many seconds without tasks (default: wait until the queue is finished)")
+	args = parser.parse_args(argv)
+
+	if args.command == 'replay':
+		watch_data = replayArchive(args.path, processes=args.processes)
+		print(watch_data)
+		if args.csv:
+			watch_data.to_csv(args.csv + '.csv', index=False)
+			print(f"Data saved to {args.csv}.csv")
+	elif args.command == 'cheapest':
+		if args.k < 1:
+			parser.error("-k must be at least 1")
+		chrono = Chrono()
+		if args.archive:
+			chrono.setArchive(PageArchive(args.archive))
+		deadline = Deadline(args.time_budget) if args.time_budget else None
+		watch_data = chrono.cheapestOffers(args.k, chrono.getQuery().withQuery(args.query), deadline)
+		coverage = watch_data.attrs['coverage']
+		if not coverage['complete']:
+			if deadline is not None and deadline.expired():
+				print("Time budget exceeded, cheapest offers found so far:")
+			elif coverage['pagesTotal'] is None:
+				print("The listing count is missing, cheapest offers of page 1 only:")
+		print(watch_data[['name', 'price']] if not watch_data.empty else watch_data)
+		if args.csv:
+			watch_data.to_csv(args.csv + '.csv', index=False)
+			print(f"Data saved to {args.csv}.csv")
+	elif args.command == 'coordinator':
+		base = SearchQuery()
+		watch_data = runCoordinator(args.queue, [base.withQuery(query) for query in args.queries], args.workers, leaseSeconds=args.lease)
+		print(watch_data)
+		print(f"Tasks: {watch_data.attrs['status']}")
+		if args.csv:
+			watch_data.to_csv(args.csv + '.csv', index=False)
+			print(f"Data saved to {args.csv}.csv")
+	elif args.command == 'worker':
+		completed = runWorker(args.queue, leaseSeconds=args.lease, archive=args.archive, idleTimeout=args.idle_timeout)
+		print(f"Worker finished after {completed} tasks")
+	else:
+		main(archive=args.archive, timeBudget=args.time_budget)
+
 if __name__ == "__main__":
-	main()
+	cli()
 
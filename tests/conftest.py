@@ -0,0 +1,116 @@
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pytest
+import requests
+
+# main.py is run as a script from src/, make it importable for the tests
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import main
+
+
+def searchPage(offers : list, listings : int = None, token : str = '') -> str:
+	"""
+	Builds a minimal search results page like the Chrono24 markup: the offers embedded as JSON-LD and,
+	if given, the total number of listings of the search.
+	"""
+	ldJson = {'@graph' : [{}, {'offers' : offers}]}
+	count = '' if listings is None else f'<strong>{listings:,} listings</strong>'
+	return (f'<html><body data-token="{token}">{count}'
+			f'<script type="application/ld+json">{json.dumps(ldJson)}</script></body></html>')
+
+
+class FakeResponse:
+	"""
+	The parts of a 'requests.Response' used by main.py.
+	"""
+	def __init__(self, url : str, text : str = '', status_code : int = 200):
+		self.url = url
+		self.text = text
+		self.status_code = status_code
+
+
+class FakeSite:
+	"""
+	In-memory Chrono24 search, served through a replacement for 'requests.get'.
+
+	The catalogue maps a search text to all of its offers, which are paginated with the 'showPage' and
+	'pageSize' parameters of the request and sorted by price for 'sortorder=1'. Like the real site, a page
+	number past the end shows the last page.
+
+	Attributes:
+		catalogue (dict): The offers of every known search text.
+		delay (float): Seconds every search results page takes to load, a request with a shorter timeout times out.
+		errors (dict): Exceptions (or status codes) returned for a (search text, page) instead of the page.
+		failureRate (float): Probability that a search results page fails with a connection error.
+		showListings (bool): Whether the pages show the total number of listings.
+		sorts (bool): Whether 'sortorder=1' is honoured, otherwise the offers are served in catalogue order.
+		requests (list): The (search text, page) of every search results page served, in order.
+	"""
+	def __init__(self, catalogue : dict = None):
+		self.catalogue = catalogue or {}
+		self.delay = 0
+		self.errors = {}
+		self.failureRate = 0
+		self.showListings = True
+		self.sorts = True
+		self.requests = []
+		self.lock = threading.Lock()
+
+	def get(self, url : str, headers : dict = None, params : dict = None, timeout : float = None) -> FakeResponse:
+		if params is not None:
+			# 'getUrlSearchResults' only needs the URL the parameters resolve to
+			return FakeResponse(url + urlencode(params))
+		args = {key : values[0] for key, values in parse_qs(urlsplit(url).query).items()}
+		query, page, pageSize = args.get('query', ''), int(args['showPage']), int(args['pageSize'])
+		with self.lock:
+			self.requests.append((query, page))
+			token = len(self.requests)
+		if timeout is not None and self.delay > timeout:
+			time.sleep(timeout)
+			raise requests.exceptions.Timeout(f"Read timed out. (read timeout={timeout})")
+		time.sleep(self.delay)
+		if random.random() < self.failureRate:
+			raise requests.exceptions.ConnectionError("connection reset")
+		error = self.errors.get((query, page))
+		if isinstance(error, int):
+			return FakeResponse(url, status_code=error)
+		if error is not None:
+			raise error
+		offers = list(self.catalogue.get(query, []))
+		if self.sorts and args.get('sortorder') == '1':
+			offers.sort(key=lambda offer: float(offer['price']))
+		page = min(page, max(1, -(-len(offers) // pageSize)))
+		shown = offers[(page - 1) * pageSize : page * pageSize]
+		return FakeResponse(url, searchPage(shown, len(offers) if self.showListings else None, str(token)))
+
+	def pagesServed(self, query : str, page : int) -> int:
+		"""
+		Counts how often a search results page was requested.
+		"""
+		return self.requests.count((query, page))
+
+
+@pytest.fixture
+def site(monkeypatch):
+	"""
+	Serves the requests of main.py from a FakeSite and skips the WebDriver setup, so no network is used.
+	"""
+	fake = FakeSite()
+	monkeypatch.setattr(main.requests, 'get', fake.get)
+	monkeypatch.setattr(main.Driver, '__init__', lambda self: None)
+	return fake
+
+
+@pytest.fixture
+def chrono(site):
+	"""
+	A real Chrono backed by the FakeSite of the 'site' fixture.
+	"""
+	return main.Chrono()
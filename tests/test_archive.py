@@ -0,0 +1,42 @@
+from main import PageArchive, SearchQuery, replayArchive
+
+
+def test_append_and_read_round_trip(tmp_path):
+	archive = PageArchive(str(tmp_path / 'pages.warc.gz'))
+	archive.append('https://example.com/1', '<html>one</html>')
+	archive.append('https://example.com/2', '<html>twö</html>', kind='listingSize')
+
+	records = archive.records()
+	assert [archive.read(r) for r in records] == ['<html>one</html>', '<html>twö</html>']
+	assert [r['kind'] for r in records] == ['offers', 'listingSize']
+
+
+def test_truncated_index_line_is_skipped(tmp_path):
+	archive = PageArchive(str(tmp_path / 'pages.warc.gz'))
+	archive.append('https://example.com/1', '<html>one</html>')
+	with open(archive.indexPath, 'a', encoding='utf-8') as f:
+		f.write('{"url": "https://example.com/2", "off')  # interrupted write
+
+	assert [r['url'] for r in archive.records()] == ['https://example.com/1']
+
+	archive.append('https://example.com/3', '<html>three</html>')
+	assert [archive.read(r) for r in archive.records()] == ['<html>one</html>', '<html>three</html>']
+
+
+def test_replay_skips_listing_size_pages_and_keeps_fetch_metadata(tmp_path, site, chrono):
+	path = str(tmp_path / 'pages.warc.gz')
+	site.catalogue = {'stub' : [{'name' : f"watch {i}", 'price' : str(1000 + i)} for i in range(5)]}
+	chrono.setArchive(PageArchive(path))
+	query = SearchQuery(query='stub', pageSize=2)
+
+	# page 1 is fetched for the listing count and again for its offers, the copies differ in a per-request token
+	assert chrono.getListingSize(query) == 5
+	offers, coverage = chrono.crawlOffers(query)
+	assert coverage['complete'] and len(offers) == 5
+	assert [record['kind'] for record in PageArchive(path).records()] == ['listingSize', 'offers', 'offers', 'offers']
+
+	table = replayArchive(path, processes=2)
+
+	assert sorted(table['price']) == [1000 + i for i in range(5)]
+	assert table['pageUrl'].nunique() == 3
+	assert table['fetched'].notna().all()
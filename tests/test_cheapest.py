@@ -0,0 +1,84 @@
+import pytest
+
+from main import SearchQuery, cli
+
+
+def serve(site, prices : list, pageSize : int = 4) -> SearchQuery:
+	"""
+	Puts a search into the fake site. Like the website, pages beyond the last one are served as full pages
+	(repeating the last page), so pagination has to be bounded by the listing count.
+	"""
+	site.catalogue = {'stub' : [{'name' : f"watch {price}", 'price' : str(price), 'url' : f"/watch/{price}"} for price in prices]}
+	return SearchQuery(query='stub', pageSize=pageSize)
+
+
+def pages(site) -> list:
+	return [page for query, page in site.requests]
+
+
+def test_cheapest_offers_terminate_early_on_sorted_results(site, chrono):
+	table = chrono.cheapestOffers(k=3, query=serve(site, range(139, 99, -1)))
+
+	assert list(table['price']) == [100, 101, 102]
+	assert pages(site) == [1]
+	assert table.attrs['coverage']['complete'] and table.attrs['coverage']['pagesTotal'] == 10
+
+
+def test_cheapest_offers_are_correct_on_unsorted_results(site, chrono):
+	site.sorts = False
+	table = chrono.cheapestOffers(k=3, query=serve(site, [130, 105, 120, 101, 150, 100, 111, 140]))
+
+	assert list(table['price']) == [100, 101, 105]
+	assert pages(site) == [1, 2]
+
+
+def test_pagination_is_bounded_by_listing_count(site, chrono):
+	# unsorted, fewer than k priced offers and a listing count that is a multiple of the page size
+	site.sorts = False
+	table = chrono.cheapestOffers(k=20, query=serve(site, [120, 110, 130, 100, 150, 140, 170, 160]))
+
+	assert pages(site) == [1, 2]
+	assert len(table) == 8 and table.attrs['coverage']['complete']
+
+
+def test_pagination_stops_after_first_page_without_listing_count(site, chrono):
+	site.sorts = False
+	site.showListings = False
+	table = chrono.cheapestOffers(k=20, query=serve(site, [120, 110, 130, 100, 150, 140, 170, 160]))
+
+	assert pages(site) == [1]
+	assert not table.attrs['coverage']['complete'] and table.attrs['coverage']['pagesTotal'] is None
+
+
+def test_offers_with_missing_fields_are_kept(site, chrono):
+	query = serve(site, range(100, 110))
+	site.catalogue['stub'][0]['url'] = None
+	table = chrono.cheapestOffers(k=3, query=query)
+
+	assert list(table['price']) == [100, 101, 102]
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_k_must_be_positive(site, chrono, k):
+	with pytest.raises(ValueError):
+		chrono.cheapestOffers(k=k, query=serve(site, range(100, 110)))
+
+
+def test_cli_reports_missing_listing_count(site, capsys):
+	# unsorted and more than one page of the default page size, so page 1 alone cannot decide
+	serve(site, range(400, 100, -1))
+	site.sorts = False
+	site.showListings = False
+	cli(['cheapest', 'stub', '-k', '3'])
+
+	output = capsys.readouterr().out
+	assert "listing count is missing" in output and "Time budget" not in output
+
+
+def test_cli_reports_exceeded_time_budget(site, capsys):
+	serve(site, range(100, 140))
+	site.delay = 0.3
+	cli(['--time-budget', '0.1', 'cheapest', 'stub', '-k', '3'])
+
+	output = capsys.readouterr().out
+	assert "Time budget exceeded" in output and "listing count" not in output
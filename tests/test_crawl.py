@@ -0,0 +1,58 @@
+import time
+
+import requests
+
+from main import Deadline, SearchQuery
+
+
+def watches(pages : int) -> list:
+	"""
+	Offers for a search with the given number of pages of 'pageSize=2', named after their page.
+	"""
+	return [{'name' : f"watch {i // 2 + 1}.{i % 2}", 'price' : str(1000 + i)} for i in range(2 * pages)]
+
+
+def test_crawl_without_deadline_is_complete_and_loads_the_first_page_once(site, chrono):
+	site.catalogue = {'stub' : watches(5)}
+
+	offers, coverage = chrono.crawlOffers(SearchQuery(query='stub', pageSize=2), workers=3)
+
+	assert [offer['name'] for offer in offers] == [offer['name'] for offer in watches(5)]
+	assert coverage['complete'] and coverage['pagesFetched'] == coverage['pagesTotal'] == 5
+	assert [site.pagesServed('stub', page) for page in range(1, 6)] == [1] * 5
+
+
+def test_crawl_returns_partial_result_when_deadline_expires(site, chrono):
+	site.catalogue = {'stub' : watches(10)}
+	site.delay = 0.2
+	start = time.monotonic()
+
+	offers, coverage = chrono.crawlOffers(SearchQuery(query='stub', pageSize=2), deadline=Deadline(0.7), workers=2)
+
+	assert time.monotonic() - start < 1.1
+	assert not coverage['complete']
+	assert 0 < coverage['pagesFetched'] < 10 and coverage['pagesTotal'] == 10
+	assert len(offers) == 2 * coverage['pagesFetched']
+
+
+def test_failed_pages_do_not_discard_fetched_pages(site, chrono):
+	site.catalogue = {'stub' : watches(5)}
+	site.errors = {('stub', 2) : requests.exceptions.ConnectionError("connection reset"), ('stub', 4) : 503}
+
+	offers, coverage = chrono.crawlOffers(SearchQuery(query='stub', pageSize=2), workers=2)
+
+	assert sorted({offer['name'].split('.')[0] for offer in offers}) == ["watch 1", "watch 3", "watch 5"]
+	assert coverage['pagesFetched'] == 3 and coverage['pagesFailed'] == 2
+	assert sorted(coverage['failures']) == [2, 4]
+	assert not coverage['complete']
+
+
+def test_crawl_without_listing_count_keeps_the_first_page(site, chrono):
+	site.catalogue = {'stub' : watches(3)}
+	site.showListings = False
+
+	offers, coverage = chrono.crawlOffers(SearchQuery(query='stub', pageSize=2))
+
+	assert [offer['name'] for offer in offers] == ["watch 1.0", "watch 1.1"]
+	assert coverage['pagesFetched'] == 1 and coverage['pagesTotal'] is None
+	assert not coverage['complete'] and site.requests == [('stub', 1)]
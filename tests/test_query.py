@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from main import SearchQuery
+
+
+def test_concurrent_queries_through_one_chrono_do_not_interfere(site, chrono):
+	references = ['126610LN', '116500LN', '5711/1A']
+	site.catalogue = {reference : [{'name' : f"{reference} #{i}", 'price' : str(1000 + i)} for i in range(12)]
+					  for reference in references}
+	site.delay = 0.01
+	queries = [SearchQuery(query=reference, pageSize=5).withPage(page) for reference in references for page in (1, 2, 3)]
+
+	with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+		results = list(executor.map(chrono.loadOffers, queries))
+
+	for query, offers in zip(queries, results):
+		start = (query.showPage - 1) * query.pageSize
+		expected = [f"{query.query} #{i}" for i in range(start, min(start + query.pageSize, 12))]
+		assert [offer['name'] for offer in offers] == expected
+	assert chrono.getPayload()['query'] == ''
+
+
+def test_empty_explicit_query_is_rejected_without_prompting(site, chrono, monkeypatch):
+	monkeypatch.setattr('builtins.input', lambda *args: pytest.fail("explicit queries must not prompt"))
+
+	with pytest.raises(ValueError):
+		chrono.loadOffers(SearchQuery(query=''))
+
+	assert chrono.getPayload()['query'] == '' and site.requests == []
+
+
+def test_default_query_prompts_for_the_reference_and_stores_it(site, chrono, monkeypatch):
+	site.catalogue = {'126610LN' : [{'name' : 'Rolex Submariner', 'price' : '9000'}]}
+	monkeypatch.setattr('builtins.input', lambda *args: '126610LN')
+
+	offers = chrono.loadOffers()
+
+	assert [offer['name'] for offer in offers] == ['Rolex Submariner']
+	assert chrono.getPayload()['query'] == '126610LN'
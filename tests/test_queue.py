@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import time
+
+from main import SearchQuery, WorkQueue, buildOffersTable, runCoordinator, runWorker
+
+
+def serve(site) -> None:
+	"""
+	Puts two searches of 7 and 3 pages of 'pageSize=3' into the fake site.
+	"""
+	site.catalogue = {query : [{'name' : f"{query} offer {i}", 'price' : str(1000 + i)} for i in range(3 * pages)]
+					  for query, pages in (('126610LN', 7), ('116500LN', 3))}
+
+
+def leaseAndCrash(path : str) -> None:
+	WorkQueue(path).lease('crashed', 0.5)
+	os._exit(0)
+
+
+def work(path : str) -> None:
+	runWorker(path, leaseSeconds=0.5, pollSeconds=0.05)
+
+
+def test_expired_lease_is_taken_over_and_stale_worker_cannot_release_it(tmp_path):
+	queue = WorkQueue(str(tmp_path / 'queue.db'))
+	queue.submit(SearchQuery(query='126610LN'))
+
+	taskId, query = queue.lease('a', 0.05)
+	assert query.query == '126610LN' and query.showPage == 1
+	assert queue.lease('b', 60) is None
+	time.sleep(0.1)
+	assert queue.lease('b', 60)[0] == taskId
+
+	assert not queue.fail(taskId, 'a', "stale failure")
+	assert queue.lease('c', 60) is None
+	assert queue.status()['leased'] == 1
+
+
+def test_first_page_adds_remaining_pages(tmp_path):
+	queue = WorkQueue(str(tmp_path / 'queue.db'))
+	queue.submit(SearchQuery(query='126610LN'))
+	queue.submit(SearchQuery(query='126610LN', showPage=3))  # same search
+
+	taskId, query = queue.lease('a', 60)
+	assert queue.complete(taskId, 'a', [{'name' : 'watch'}], totalPages=4)
+	assert not queue.complete(taskId, 'b', [{'name' : 'watch'}], totalPages=4)
+	assert queue.status() == {'pending' : 3, 'leased' : 0, 'done' : 1, 'failed' : 0}
+
+
+def test_task_fails_after_max_attempts(tmp_path):
+	queue = WorkQueue(str(tmp_path / 'queue.db'), maxAttempts=2)
+	queue.submit(SearchQuery(query='126610LN'))
+	queue.close()
+
+	for attempt in range(2):
+		taskId, query = queue.lease('a', 60)
+		assert queue.fail(taskId, 'a', "ConnectionError")
+	assert queue.lease('a', 60) is None
+	assert queue.status()['failed'] == 1 and queue.isFinished()
+
+
+def test_worker_waits_until_queue_is_closed(tmp_path, site, chrono):
+	serve(site)
+	path = str(tmp_path / 'queue.db')
+	queue = WorkQueue(path)
+	assert not queue.isFinished()
+
+	start = time.monotonic()
+	assert runWorker(path, pollSeconds=0.05, chrono=chrono, idleTimeout=0.3) == 0
+	assert time.monotonic() - start >= 0.3
+
+	queue.submit(SearchQuery(query='116500LN', pageSize=3))
+	queue.close()
+	assert runWorker(path, pollSeconds=0.05, chrono=chrono) == 3
+	assert queue.isFinished()
+	# the first page is requested once, for its offers and the listing count together
+	assert site.requests == [('116500LN', 1), ('116500LN', 2), ('116500LN', 3)]
+
+
+def test_first_page_without_listing_count_fails(tmp_path, site, chrono):
+	serve(site)
+	site.showListings = False
+	path = str(tmp_path / 'queue.db')
+	queue = WorkQueue(path, maxAttempts=2)
+	queue.submit(SearchQuery(query='116500LN', pageSize=3))
+	queue.close()
+
+	assert runWorker(path, pollSeconds=0.05, chrono=chrono) == 0
+	assert queue.status() == {'pending' : 0, 'leased' : 0, 'done' : 0, 'failed' : 1}
+	assert site.requests == [('116500LN', 1)] * 2
+
+
+def test_coordinator_returns_only_its_own_searches(tmp_path, site, chrono):
+	serve(site)
+	path = str(tmp_path / 'queue.db')
+	queue = WorkQueue(path)
+	queue.submit(SearchQuery(query='126610LN', pageSize=3))
+	queue.close()
+	runWorker(path, chrono=chrono)
+
+	# a later crawl with the same queue file, its search is crawled by a worker before the coordinator waits
+	search = SearchQuery(query='116500LN', pageSize=3)
+	queue.submit(search)
+	queue.close()
+	runWorker(path, chrono=chrono)
+	table = runCoordinator(path, [search], pollSeconds=0.05)
+
+	assert len(table) == 9 and set(table['query']) == {'116500LN'}
+	assert queue.status()['done'] == 10
+
+
+def test_local_workers_complete_every_page_once(tmp_path, site):
+	serve(site)
+	site.delay = 0.01
+	site.failureRate = 0.2
+	path = str(tmp_path / 'queue.db')
+	context = multiprocessing.get_context('fork')
+	queue = WorkQueue(path, maxAttempts=10)
+	# workers start before the searches are submitted
+	workers = [context.Process(target=work, args=(path,)) for i in range(4)]
+	for worker in workers:
+		worker.start()
+	time.sleep(0.2)
+	for query in ('126610LN', '116500LN'):
+		queue.submit(SearchQuery(query=query, pageSize=3))
+	crashed = context.Process(target=leaseAndCrash, args=(path,))
+	crashed.start()
+	crashed.join()
+	queue.close()
+	for worker in workers:
+		worker.join(timeout=60)
+
+	assert queue.status() == {'pending' : 0, 'leased' : 0, 'done' : 10, 'failed' : 0}
+	table = buildOffersTable(queue.results())
+	assert len(table) == 30 and table['name'].is_unique
+	assert table['query'].value_counts().to_dict() == {'126610LN' : 21, '116500LN' : 9}
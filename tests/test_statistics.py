@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+import pytest
+import requests
+
+from main import Deadline, SearchQuery, estimatePriceStatistics, studentQuantile
+
+
+def serve(site, pagePrices : list) -> SearchQuery:
+	"""
+	Puts a search with the given prices per page of 120 offers into the fake site.
+	"""
+	site.catalogue = {'stub' : [{'name' : 'watch', 'price' : str(price)} for prices in pagePrices for price in prices]}
+	return SearchQuery(query='stub')
+
+
+def sampledPages(site) -> list:
+	"""
+	The pages loaded for the sample, i.e. all requests but the one for the listing count.
+	"""
+	return [page for query, page in site.requests[1:]]
+
+
+def population(pages : int = 50, seed : int = 1) -> list:
+	"""
+	Skewed prices with a price level varying from page to page.
+	"""
+	rng = np.random.default_rng(seed)
+	return [rng.lognormal(9 + rng.normal(0, 0.3), 0.5, 120) for page in range(pages)]
+
+
+@pytest.mark.parametrize("p, df, expected", [(0.975, 1, 12.706), (0.975, 2, 4.303), (0.975, 3, 3.182), (0.995, 3, 5.841),
+											 (0.975, 10, 2.228), (0.975, 30, 2.042), (0.025, 4, -2.776)])
+def test_student_quantile_matches_table(p, df, expected):
+	assert studentQuantile(p, df) == pytest.approx(expected, abs=1e-3)
+
+
+def test_all_pages_give_exact_statistics():
+	pages = population(pages=4)
+	table = estimatePriceStatistics(pages, 4)
+	prices = np.concatenate(pages)
+
+	assert table.loc['mean', 'estimate'] == pytest.approx(prices.mean())
+	assert table.loc['50%', 'estimate'] == pytest.approx(np.median(prices))
+	assert (table['lower'] == table['upper']).all() and table.attrs['relativeError'] == 0
+
+
+def test_confidence_interval_coverage_of_the_mean():
+	# few sampled pages of skewed prices are the hard case, the coverage stays close to the nominal 95%
+	pages = population()
+	truth = np.concatenate(pages).mean()
+	trials = 200
+	covered = 0
+	for trial in range(trials):
+		sample = [pages[i] for i in random.Random(trial).sample(range(len(pages)), 3)]
+		table = estimatePriceStatistics(sample, len(pages), seed=trial, resamples=200)
+		covered += table.loc['mean', 'lower'] <= truth <= table.loc['mean', 'upper']
+	assert covered / trials >= 0.88
+
+
+def test_sampling_stops_at_target_precision_after_minimum_pages(site, chrono):
+	query = serve(site, [[1000] * 120] * 20)
+	table = chrono.estimateStatistics(query, precision=0.05, initialPages=2, batchPages=1, minPages=3, seed=0)
+
+	assert len(sampledPages(site)) == 3
+	assert table.attrs['complete'] and table.loc['mean', 'estimate'] == 1000
+
+
+def test_sampling_fetches_only_part_of_the_pages(site, chrono):
+	pages = population(pages=200)
+	table = chrono.estimateStatistics(serve(site, pages), precision=0.1, seed=0)
+
+	assert table.attrs['complete'] and table.attrs['relativeError'] <= 0.1
+	assert table.attrs['pagesFetched'] < 100
+	assert table.loc['mean', 'lower'] <= np.concatenate(pages).mean() <= table.loc['mean', 'upper']
+
+
+def test_deadline_before_listing_count_returns_empty_estimate(site, chrono):
+	query = serve(site, population(pages=5))
+	site.delay = 0.2
+	table = chrono.estimateStatistics(query, deadline=Deadline(0.1))
+
+	assert table.attrs['pagesTotal'] is None and table.attrs['listings'] is None
+	assert not table.attrs['complete']
+	assert table['estimate'].isna().all()
+
+
+def test_failed_pages_are_reported_and_left_out_of_the_sample(site, chrono):
+	query = serve(site, [[1000] * 120] * 4)
+	site.errors = {('stub', 2) : requests.exceptions.ConnectionError("connection reset"), ('stub', 3) : 503}
+	table = chrono.estimateStatistics(query, precision=0, initialPages=4, seed=0)
+
+	assert sorted(sampledPages(site)) == [1, 2, 3, 4]
+	assert table.attrs['pagesFailed'] == 2 and sorted(table.attrs['failures']) == [2, 3]
+	assert table.attrs['pagesFetched'] == 2 and table.attrs['pagesTotal'] == 4
+	assert not table.attrs['complete']